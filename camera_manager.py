@@ -1,30 +1,487 @@
-import cv2
 import threading
 import time
 import os
-import platform
-import gc # Import garbage collector
 import subprocess
-import numpy as np
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, FRAME_RATE
+import shutil
+import tempfile
+import glob
+import queue
+import functools
+from config import IS_RASPBERRY_PI, CAPTURE_DIR, JPEG_QUALITY, JPEG_PARAMS, jpeg_params, CAMERA_DEVICE, CAMERA_IDLE_TIMEOUT
 from dotenv import load_dotenv
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+from abc import ABC, abstractmethod
 
 # Configure logging
 import logging
 logger = logging.getLogger(__name__)
 
-IS_RASPBERRY_PI = (platform.system() == 'Linux' and 
-                   os.path.exists('/proc/device-tree/model') and 
-                   'raspberry pi' in open('/proc/device-tree/model', 'r').read().lower())
+@functools.lru_cache(maxsize=1)
+def _libcamera_vid_path() -> Optional[str]:
+    """Locate libcamera-vid once; shutil.which only stats PATH entries, no fork/exec."""
+    return shutil.which('libcamera-vid')
 
-# DEBUG: Print initial detection status
-logger.info(f"IS_RASPBERRY_PI = {IS_RASPBERRY_PI}")
+# Driver names of V4L2 nodes that are not cameras (Pi ISP, codecs, decoders)
+NON_CAMERA_V4L2_DRIVERS = ('bcm2835-codec', 'bcm2835-isp', 'rpivid', 'pispbe', 'hevc')
 
-if IS_RASPBERRY_PI:
-    logger.info("Detected Raspberry Pi system.")
-else:
-    logger.info("Not detected as Raspberry Pi system (or /proc/device-tree/model check failed).")
+def _v4l2_capture_devices() -> List[int]:
+    """
+    List /dev/videoN indices that look like cameras, straight from sysfs,
+    so only real capture nodes are ever opened.
+    """
+    devices = []
+    for node in sorted(glob.glob('/sys/class/video4linux/video*')):
+        try:
+            with open(os.path.join(node, 'name')) as f:
+                name = f.read().strip().lower()
+            with open(os.path.join(node, 'index')) as f:
+                index = int(f.read())
+        except (OSError, ValueError):
+            continue
+        # Index 0 is a device's capture node; higher indices are metadata
+        if index != 0 or any(driver in name for driver in NON_CAMERA_V4L2_DRIVERS):
+            continue
+        devices.append(int(os.path.basename(node)[len('video'):]))
+    return sorted(devices)
+
+# JPEG markers. libcamera-vid's MJPEG output is a plain concatenation of
+# JPEGs; a frame ends at the first EOI after its start-of-scan header,
+# since entropy-coded data byte-stuffs every 0xFF
+JPEG_SOI = b'\xff\xd8'
+JPEG_EOI = b'\xff\xd9'
+JPEG_SOS = 0xDA
+
+class CameraBackend(ABC):
+    """
+    A frame source for CameraManager. Backends hand over finished JPEGs;
+    CameraManager picks one in connect() and its capture loop only ever
+    calls read_frame().
+    """
+    name = 'camera'
+    is_placeholder = False  # True for a stand-in image rather than a real camera
+    
+    def __init__(self, width: int, height: int, fps: int, jpeg_quality: int):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.jpeg_quality = jpeg_quality
+    
+    @abstractmethod
+    def start(self) -> Tuple[bool, str]:
+        """
+        Open the source.
+        Returns: (success, error message)
+        """
+    
+    @abstractmethod
+    def read_frame(self) -> Optional[bytes]:
+        """Block until the next JPEG is ready; None once the source has ended or been stopped."""
+    
+    @abstractmethod
+    def stop(self):
+        """Release the source; must also wake a read_frame() blocked in another thread."""
+
+class _FrameSink:
+    """File-like target for picamera2's FileOutput; each write() is one complete JPEG."""
+    
+    def __init__(self):
+        self.frames = queue.SimpleQueue()
+    
+    def write(self, buf):
+        # Reader is behind: drop the oldest frames so the newest always gets through
+        while self.frames.qsize() > 2:
+            try:
+                self.frames.get_nowait()
+            except queue.Empty:
+                break
+        self.frames.put(buf if isinstance(buf, bytes) else bytes(buf))
+    
+    def flush(self):
+        pass
+
+class Picamera2Backend(CameraBackend):
+    """Raspberry Pi camera in-process via picamera2, using the hardware MJPEG encoder."""
+    name = 'picamera2'
+    buffer_count = 3  # One being filled, one in the encoder, one spare for scheduling jitter
+    
+    def __init__(self, width: int, height: int, fps: int, jpeg_quality: int):
+        super().__init__(width, height, fps, jpeg_quality)
+        self.picam2 = None
+        self._sink = None
+    
+    def start(self) -> Tuple[bool, str]:
+        """
+        Start the camera and the hardware encoder.
+        Returns: (success, error message)
+        """
+        try:
+            from picamera2 import Picamera2
+            from picamera2.encoders import MJPEGEncoder
+            from picamera2.outputs import FileOutput
+        except ImportError:
+            return False, "picamera2 is not installed"
+        
+        picam2 = None
+        try:
+            # The constructor already opens the camera, so a missing or busy
+            # sensor fails here and the next backend gets its turn
+            picam2 = Picamera2()
+            config = picam2.create_video_configuration(
+                main={"size": (self.width, self.height)},
+                controls={"FrameRate": self.fps},
+                buffer_count=self.buffer_count
+            )
+            picam2.configure(config)
+            # The encoder thread hands each finished JPEG to the sink, so no
+            # frame is ever copied into Python as pixels
+            self._sink = _FrameSink()
+            picam2.start_recording(MJPEGEncoder(), FileOutput(self._sink))
+        except Exception as e:
+            if picam2 is not None:
+                picam2.close()
+            logger.error(f"picamera2 failed to start: {e}")
+            return False, f"picamera2 failed to start: {e}"
+        
+        self.picam2 = picam2
+        return True, ""
+    
+    def read_frame(self) -> Optional[bytes]:
+        """Block until the encoder delivers the next JPEG; None once stopped."""
+        return self._sink.frames.get()
+    
+    def stop(self):
+        """Stop the encoder and close the camera, which releases the sensor."""
+        if self.picam2 is not None:
+            try:
+                self.picam2.stop_recording()
+            except Exception as e:
+                logger.error(f"Error stopping picamera2 encoder: {e}")
+            try:
+                # close() is what actually frees the libcamera resources, so it
+                # runs even if stopping the encoder failed
+                self.picam2.close()
+            except Exception as e:
+                logger.error(f"Error closing picamera2: {e}")
+            finally:
+                self.picam2 = None
+        if self._sink is not None:
+            self._sink.frames.put(None)  # Wake a reader blocked in read_frame
+
+class LibcameraVidBackend(CameraBackend):
+    """Raspberry Pi camera via a libcamera-vid process writing hardware MJPEG to stdout."""
+    name = 'libcamera-vid'
+    
+    def __init__(self, width: int, height: int, fps: int, jpeg_quality: int):
+        super().__init__(width, height, fps, jpeg_quality)
+        self.process = None
+        self._stream = None
+        self._log = None  # libcamera-vid's stderr, kept only to report why it failed
+        self._chunk = bytearray(65536)  # Reused for every read instead of a new bytes per read
+        self._chunk_view = memoryview(self._chunk)
+        self._pending = bytearray()
+        # Parse state for the frame at the front of _pending
+        self._scan_start = None  # Where entropy data begins, once the headers are walked
+        self._scan_pos = 0  # How far the EOI search has got, so bytes are scanned once
+    
+    def start(self) -> Tuple[bool, str]:
+        """
+        Start libcamera-vid.
+        Returns: (success, error message)
+        """
+        # Check if libcamera-vid is available
+        libcamera_vid = _libcamera_vid_path()
+        if libcamera_vid is None:
+            logger.error("libcamera-vid is not available")
+            return False, "libcamera-vid is not available"
+        
+        # libcamera keeps logging to stderr for the life of the process. A pipe
+        # nobody drains would eventually fill and stall the camera, so it goes
+        # to an anonymous file instead
+        self._log = tempfile.TemporaryFile()
+        
+        # Start libcamera-vid process. The Pi's hardware encoder produces the
+        # JPEGs, so frames are served as-is instead of being decoded from
+        # H.264 and re-encoded on the CPU
+        self.process = subprocess.Popen(
+            [
+                libcamera_vid,
+                '--width', str(self.width),
+                '--height', str(self.height),
+                '--framerate', str(self.fps),
+                '--codec', 'mjpeg',  # Hardware MJPEG encoder
+                '--quality', str(self.jpeg_quality),  # Frames double as stills
+                '--nopreview',  # Disable preview window
+                '--timeout', '0',  # Run indefinitely
+                '--flush',  # Push each frame down the pipe as soon as it is encoded
+                '--tuning-file', '/usr/share/libcamera/ipa/rpi/vc4/rpi_tuning.yaml',  # Use VC4 tuning
+                '-o', '-'  # Output to stdout
+            ],
+            stdout=subprocess.PIPE,
+            stderr=self._log
+        )
+        # Read the MJPEG stream straight from the process
+        self._stream = self.process.stdout
+        
+        # Wait for the process to start
+        time.sleep(2)
+        
+        # Check if the process is still running
+        if self.process.poll() is not None:
+            self._log.seek(0)
+            error = self._log.read().decode(errors='replace')
+            logger.error(f"libcamera-vid failed to start: {error}")
+            self.stop()
+            return False, f"libcamera-vid failed to start: {error}"
+        
+        self._pending.clear()
+        self._scan_start = None
+        self._scan_pos = 0
+        return True, ""
+    
+    def read_frame(self) -> Optional[bytes]:
+        """Block until the next complete JPEG arrives; None once the stream ends."""
+        readinto = self._stream.readinto1  # Returns whatever is buffered instead of waiting for a full chunk
+        chunk = self._chunk
+        pending = self._pending
+        while True:
+            # Publish as soon as the EOI arrives instead of waiting for the next SOI
+            end = self._find_frame_end()
+            if end > 0:
+                # Copy the frame out once; slicing the bytearray first would copy twice
+                with memoryview(pending) as view:
+                    frame = bytes(view[:end])
+                del pending[:end]
+                self._scan_start = None
+                self._scan_pos = 0
+                return frame
+            
+            n = readinto(chunk)
+            if not n:
+                return None
+            pending += self._chunk_view[:n]
+    
+    def _find_frame_end(self) -> int:
+        """Return the length of the complete JPEG at the front of _pending, or -1 if more data is needed."""
+        pending = self._pending
+        if self._scan_start is None:
+            # Resync on SOI, dropping anything from before the first frame
+            start = pending.find(JPEG_SOI)
+            if start < 0:
+                del pending[:-1]  # Keep a trailing 0xFF in case the marker is split
+                return -1
+            if start > 0:
+                del pending[:start]
+            
+            # Walk the header segments by their lengths up to SOS, so table
+            # bytes can never be mistaken for an EOI
+            pos = 2
+            while True:
+                if len(pending) < pos + 4:
+                    return -1
+                if pending[pos] != 0xFF:
+                    del pending[:2]  # Corrupt header; look for the next SOI
+                    return self._find_frame_end()
+                marker = pending[pos + 1]
+                if marker == 0xFF:
+                    pos += 1  # Fill byte
+                    continue
+                length = int.from_bytes(pending[pos + 2:pos + 4], 'big')
+                pos += 2 + length
+                if marker == JPEG_SOS:
+                    break
+            self._scan_start = pos
+            self._scan_pos = pos
+        
+        end = pending.find(JPEG_EOI, self._scan_pos)
+        if end < 0:
+            # Resume from the last byte next time; it may be the EOI's 0xFF
+            self._scan_pos = max(self._scan_start, len(pending) - 1)
+            return -1
+        return end + 2
+    
+    def stop(self):
+        """Close the stream, then terminate libcamera-vid and wait for it to exit, which releases the sensor."""
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception as e:
+                logger.error(f"Error closing libcamera-vid stream: {e}")
+            finally:
+                self._stream = None
+        
+        if self.process is not None:
+            try:
+                self.process.terminate()
+                self.process.wait(timeout=5)
+            except Exception as e:
+                logger.error(f"Error terminating libcamera-vid process: {e}")
+                try:
+                    self.process.kill()
+                except:
+                    pass
+            finally:
+                self.process = None
+        
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+class V4L2Backend(CameraBackend):
+    """USB/V4L2 webcam through OpenCV, for development on machines without a Pi camera."""
+    name = 'v4l2'
+    stale_grab_time = 0.001  # A grab faster than this came from a queue, not the sensor
+    max_drain = 4  # Upper bound on queued frames skipped per read
+    
+    def __init__(self, width: int, height: int, fps: int, jpeg_quality: int, device: Optional[int] = CAMERA_DEVICE):
+        super().__init__(width, height, fps, jpeg_quality)
+        self.device = device
+        self._cap = None
+        self._encode_params = None
+    
+    def start(self) -> Tuple[bool, str]:
+        """
+        Open the webcam.
+        Returns: (success, error message)
+        """
+        try:
+            import cv2  # Only needed off the Pi
+        except ImportError:
+            return False, "OpenCV is not installed"
+        
+        devices = [self.device] if self.device is not None else _v4l2_capture_devices()
+        if not devices:
+            return False, "No V4L2 capture devices found"
+        
+        cap = None
+        for device in devices:
+            cap = self._open_device(cv2, device)
+            if cap is not None:
+                self.device = device
+                break
+        if cap is None:
+            return False, f"Could not open video devices {devices}"
+        
+        self._cap = cap
+        # set_jpeg_quality() may have moved away from the configured default
+        self._encode_params = JPEG_PARAMS if self.jpeg_quality == JPEG_QUALITY else jpeg_params(self.jpeg_quality)
+        return True, ""
+    
+    def _open_device(self, cv2, device: int):
+        """Open /dev/video<device>, returning the capture or None."""
+        # Prefer a GStreamer pipeline that hands the webcam's own JPEGs to
+        # appsink untouched, keeping only the newest buffer
+        pipeline = (f"v4l2src device=/dev/video{device} ! "
+                    f"image/jpeg,width={self.width},height={self.height},framerate={self.fps}/1 ! "
+                    "appsink drop=true max-buffers=1 sync=false")
+        cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if cap.isOpened():
+            logger.info(f"Webcam /dev/video{device} opened through GStreamer MJPEG pipeline")
+            return cap
+        
+        cap = cv2.VideoCapture(device, cv2.CAP_V4L2)
+        if not cap.isOpened():
+            return None
+        
+        # Ask for the webcam's own MJPEG so frames usually pass through like
+        # libcamera-vid's
+        mjpg = cv2.VideoWriter_fourcc(*'MJPG')
+        cap.set(cv2.CAP_PROP_FOURCC, mjpg)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        cap.set(cv2.CAP_PROP_FPS, self.fps)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Newest frame only, no backlog
+        # Skip OpenCV's decode only if the driver really switched to MJPG.
+        # Webcams that ignore the request deliver raw YUYV, which needs
+        # OpenCV's conversion to BGR before it can be encoded
+        if int(cap.get(cv2.CAP_PROP_FOURCC)) == mjpg:
+            cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+            logger.info(f"Webcam /dev/video{device} opened through V4L2 (MJPEG passthrough)")
+        else:
+            logger.info(f"Webcam /dev/video{device} opened through V4L2 (no MJPEG, encoding in software)")
+        return cap
+    
+    def read_frame(self) -> Optional[bytes]:
+        """Block until the webcam delivers a frame; None if the read fails."""
+        cap = self._cap
+        # Grab without decoding until a grab has to wait for the sensor, so a
+        # backlog left by a slow consumer is dropped rather than served late
+        for _ in range(self.max_drain):
+            started = time.monotonic()
+            if not cap.grab():
+                return None
+            if time.monotonic() - started > self.stale_grab_time:
+                break
+        ret, data = cap.retrieve()
+        if not ret:
+            return None
+        if data.ndim < 3:
+            # Encoded buffers come back as a single row of bytes
+            raw = data.tobytes()
+            if raw.startswith(JPEG_SOI):
+                return raw  # Raw MJPEG from the device
+        
+        # The driver ignored the MJPG request, so OpenCV converted the frame
+        # to BGR pixels
+        import cv2
+        ret, buffer = cv2.imencode('.jpg', data, self._encode_params)
+        return buffer.tobytes() if ret else None
+    
+    def stop(self):
+        """Release the webcam."""
+        if self._cap is not None:
+            try:
+                self._cap.release()
+            except Exception as e:
+                logger.error(f"Error releasing webcam: {e}")
+            finally:
+                self._cap = None
+
+class DummyBackend(CameraBackend):
+    """Placeholder 'No Camera' frame so viewers get a picture when no camera is found."""
+    name = 'dummy'
+    is_placeholder = True
+    refresh_interval = 1.0  # The image never changes; resend it just often enough to keep streams alive
+    
+    def __init__(self, width: int, height: int, fps: int, jpeg_quality: int):
+        super().__init__(width, height, fps, jpeg_quality)
+        self._jpeg = None
+        self._stopped = threading.Event()
+        self._sent_first = False
+    
+    def start(self) -> Tuple[bool, str]:
+        """
+        Render and encode the placeholder once.
+        Returns: (success, error message)
+        """
+        try:
+            import cv2
+            import numpy as np
+        except ImportError:
+            return False, "OpenCV is not installed"
+        
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        frame[:, :, 0] = 255  # Blue background
+        cv2.putText(frame, "No Camera Available", (50, self.height // 2),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality])
+        if not ret:
+            return False, "Could not encode placeholder frame"
+        
+        self._jpeg = buffer.tobytes()
+        self._stopped.clear()
+        self._sent_first = False
+        return True, ""
+    
+    def read_frame(self) -> Optional[bytes]:
+        """Return the cached JPEG, immediately the first time and then once per refresh_interval."""
+        if self._sent_first and self._stopped.wait(self.refresh_interval):
+            return None
+        self._sent_first = True
+        return None if self._stopped.is_set() else self._jpeg
+    
+    def stop(self):
+        """Wake a waiting read_frame so the capture loop can exit."""
+        self._stopped.set()
 
 class CameraManager:
     def __init__(self):
@@ -35,13 +492,18 @@ class CameraManager:
         self.frame_width = 640
         self.frame_height = 480
         self.fps = 30
+        self.jpeg_quality = JPEG_QUALITY  # Passed to the backend's encoder on connect
         
-        # Camera state
-        self.camera = None
+        # Camera state; camera is the active backend
+        self.camera: Optional[CameraBackend] = None
         self.is_running = False
-        self.current_frame = None
-        self.frame_lock = threading.Lock()
-        self.last_frame_time = 0
+        # (seq, JPEG bytes, capture time) for the latest frame. The capture
+        # thread replaces the whole tuple with one assignment, so readers
+        # always see a consistent triple without locking or retrying
+        self._latest: Tuple[int, Optional[bytes], float] = (0, None, 0)
+        # Set once the next frame is published, then replaced, so every
+        # waiting reader is woken exactly once per frame
+        self._frame_event = threading.Event()
         self.frame_interval = 1.0 / self.fps
         
         # Connection state
@@ -51,82 +513,68 @@ class CameraManager:
         # Initialize capture thread
         self.capture_thread = None
         
-        # Libcamera process
-        self.libcamera_process = None
+        # Demand-driven capture: the backend is stopped while nobody reads
+        # frames and restarted by the next reader. Integer nanoseconds keep the
+        # per-frame idle check to one int subtract and compare
+        self.is_idle = False
+        self._idle_timeout_ns = int(CAMERA_IDLE_TIMEOUT * 1e9)
+        self._last_consumer_ns = time.monotonic_ns()
+        self._consumer_event = threading.Event()
+        
+        # Recording state. _rec_state_lock only guards the flag and filename so
+        # status reads never wait on the writer; frames reach the writer thread
+        # through a queue, and _rec_transition_lock serializes start/stop
+        self.is_recording = False
+        self.recording_filename = None
+        self._rec_state_lock = threading.Lock()
+        self._rec_transition_lock = threading.Lock()
+        self._rec_queue: Optional[queue.SimpleQueue] = None
+        self._rec_thread = None
         
     def connect(self) -> bool:
-        """Establish connection to the Raspberry Pi camera."""
+        """Connect to the Raspberry Pi camera, or a V4L2 webcam elsewhere."""
         try:
             if self.camera is not None:
                 self.disconnect()
             
-            if not IS_RASPBERRY_PI:
-                self.connection_error = "Not running on a Raspberry Pi"
-                return False
-            
-            # Check if libcamera-vid is available
-            try:
-                subprocess.run(['which', 'libcamera-vid'], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                logger.info("libcamera-vid is available")
-            except subprocess.CalledProcessError:
-                logger.error("libcamera-vid is not available")
-                self.connection_error = "libcamera-vid is not available"
-                return False
-            
-            # Start libcamera-vid process
-            self.libcamera_process = subprocess.Popen(
-                [
-                    'libcamera-vid',
-                    '--width', str(self.frame_width),
-                    '--height', str(self.frame_height),
-                    '--framerate', str(self.fps),
-                    '--codec', 'h264',
-                    '--inline',  # Enable h264 inline headers
-                    '--listen',  # Enable TCP connection
-                    '--nopreview',  # Disable preview window
-                    '--timeout', '0',  # Run indefinitely
-                    '--framerate', '30',  # Set framerate
-                    '--bitrate', '1000000',  # Lower bitrate for faster encoding
-                    '--profile', 'baseline',  # Use baseline profile for lower latency
-                    '--level', '4.0',  # Use level 4.0 for better compatibility
-                    '--intra', '30',  # Set keyframe interval
-                    '--tuning-file', '/usr/share/libcamera/ipa/rpi/vc4/rpi_tuning.yaml',  # Use VC4 tuning
-                    '-o', 'tcp://127.0.0.1:8888'  # Output to TCP
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            # Wait for the process to start
-            time.sleep(2)
+            # Pick the backend once; the capture loop then just calls read_frame.
+            # On the Pi, picamera2 avoids libcamera-vid's process and pipe
+            if IS_RASPBERRY_PI:
+                candidates = (Picamera2Backend, LibcameraVidBackend, DummyBackend)
+            else:
+                candidates = (V4L2Backend, DummyBackend)
             
-            # Check if the process is still running
-            if self.libcamera_process.poll() is not None:
-                error = self.libcamera_process.stderr.read().decode()
-                logger.error(f"libcamera-vid failed to start: {error}")
-                self.connection_error = f"libcamera-vid failed to start: {error}"
+            backend = None
+            for backend_class in candidates:
+                candidate = backend_class(self.frame_width, self.frame_height, self.fps, self.jpeg_quality)
+                success, error = candidate.start()
+                if success:
+                    backend = candidate
+                    break
+                logger.warning(f"{candidate.name} unavailable: {error}")
+            if backend is None:
+                self.connection_error = error
                 return False
-            
-            # Create OpenCV VideoCapture object to read from TCP
-            self.camera = cv2.VideoCapture('tcp://127.0.0.1:8888')
-            
-            if not self.camera.isOpened():
-                logger.error("Failed to open TCP connection to libcamera-vid")
-                self.connection_error = "Failed to open TCP connection to libcamera-vid"
-                return False
-            
-            # Set OpenCV buffer size to minimum
-            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.camera = backend
             
             # Start capture thread
             self.is_running = True
+            self.is_idle = False
+            self._last_consumer_ns = time.monotonic_ns()
             self.capture_thread = threading.Thread(target=self._capture_loop)
             self.capture_thread.daemon = True
             self.capture_thread.start()
             
+            if backend.is_placeholder:
+                # Streams show the placeholder, but nothing may treat it as a camera
+                self.is_connected = False
+                self.connection_error = f"No camera found: {error}"
+                logger.warning(f"No camera found, streaming the {backend.name} placeholder")
+                return False
+            
             self.is_connected = True
             self.connection_error = None
-            logger.info("Successfully connected to Raspberry Pi camera using libcamera-vid")
+            logger.info(f"Successfully connected to camera using {backend.name}")
             return True
             
         except Exception as e:
@@ -137,66 +585,137 @@ class CameraManager:
     
     def disconnect(self):
         """Disconnect from the camera and clean up resources."""
+        with self._rec_transition_lock:
+            if self.is_recording:
+                self._stop_recording()
+        
         self.is_running = False
         if self.capture_thread:
             self.capture_thread.join(timeout=1.0)
         
         if self.camera is not None:
-            try:
-                self.camera.release()
-            except Exception as e:
-                logger.error(f"Error releasing camera: {e}")
-            finally:
-                self.camera = None
-        
-        if self.libcamera_process is not None:
-            try:
-                self.libcamera_process.terminate()
-                self.libcamera_process.wait(timeout=5)
-            except Exception as e:
-                logger.error(f"Error terminating libcamera-vid process: {e}")
-                try:
-                    self.libcamera_process.kill()
-                except:
-                    pass
-            finally:
-                self.libcamera_process = None
+            self.camera.stop()
+            self.camera = None
         
         self.is_connected = False
-        self.current_frame = None
+        self._clear_frame()
+    
+    @property
+    def current_frame(self) -> Optional[bytes]:
+        """Latest frame as JPEG bytes."""
+        return self._latest[1]
+    
+    @property
+    def last_frame_time(self) -> float:
+        """Wall-clock time the latest frame was captured."""
+        return self._latest[2]
+    
+    def _clear_frame(self):
+        """Drop the last frame's reference, keeping the sequence monotonic for waiting readers."""
+        self._latest = (self._latest[0], None, 0)
     
     def _capture_loop(self):
-        """Background thread for continuous frame capture."""
+        """
+        Background thread that publishes each frame the backend delivers.
+        Backend reads block (releasing the GIL) until a frame is ready.
+        """
         logger.info("Starting capture loop")
+        backend = self.camera
+        if backend is None:
+            logger.error("Capture loop started without a camera")
+            return
+        read_frame = backend.read_frame
+        # A placeholder's frames don't mean a camera is working
+        clears_error = not backend.is_placeholder
+        
         while self.is_running:
             try:
-                if self.camera is None:
-                    time.sleep(0.001)  # Reduced sleep time
+                if (self._rec_queue is None and
+                        time.monotonic_ns() - self._last_consumer_ns > self._idle_timeout_ns):
+                    if not self._wait_for_consumer(backend):
+                        break
                     continue
                 
-                # Capture frame without checking time interval
-                ret, frame = self.camera.read()
-                if not ret:
-                    self.connection_error = "Failed to read frame"
-                    logger.error("Failed to read frame")
-                    time.sleep(0.001)  # Reduced sleep time
-                    continue
+                frame = read_frame()
+                if frame is None:
+                    self.connection_error = f"{backend.name} stream ended"
+                    logger.error(f"{backend.name} stream ended")
+                    break
+                
+                # Publish the frame with a single assignment; readers never block us
+                self._latest = (self._latest[0] + 1, frame, time.time())
+                
+                # Wake every reader blocked in wait_for_frame
+                published = self._frame_event
+                self._frame_event = threading.Event()
+                published.set()
                 
-                # Update frame without lock if possible
-                if not hasattr(self, '_frame_lock_acquired'):
-                    with self.frame_lock:
-                        self.current_frame = frame
-                        self.last_frame_time = time.time()
-                        self.connection_error = None
-                else:
-                    self.current_frame = frame
-                    self.last_frame_time = time.time()
+                # Frames are immutable bytes, so the recorder can share them
+                rec_queue = self._rec_queue
+                if rec_queue is not None:
+                    rec_queue.put(frame)
+                
+                if clears_error and self.connection_error is not None:
                     self.connection_error = None
                 
             except Exception as e:
                 self.connection_error = str(e)
                 logger.error(f"Error in capture loop: {e}")
-                time.sleep(0.001)  # Reduced sleep time
+                time.sleep(self.frame_interval)  # Back off for a frame instead of spinning on the error
+    
+    def _wait_for_consumer(self, backend) -> bool:
+        """Stop the backend until a reader shows up, then restart it. Returns False to end the loop."""
+        logger.info("No frame readers, pausing camera")
+        backend.stop()
+        self._clear_frame()  # Nobody may be handed a frame from before the pause
+        self._consumer_event.clear()
+        self.is_idle = True
+        
+        # A reader may have arrived between the idle check and the flag above
+        while (self.is_running and
+               time.monotonic_ns() - self._last_consumer_ns > self._idle_timeout_ns):
+            self._consumer_event.wait(timeout=0.5)  # Short enough for disconnect()'s join
+        self.is_idle = False
+        if not self.is_running:
+            return False
+        
+        logger.info("Frame reader returned, resuming camera")
+        success, error = backend.start()
+        if not success:
+            self.connection_error = error
+            logger.error(f"Failed to resume camera: {error}")
+            return False
+        return True
+    
+    def _note_consumer(self):
+        """Record that someone wants frames, waking the capture loop if it is idle."""
+        self._last_consumer_ns = time.monotonic_ns()
+        if self.is_idle:
+            self._consumer_event.set()
+    
+    def _read_frame(self) -> Optional[bytes]:
+        """Read the latest published frame without taking a lock."""
+        return self._latest[1]
+    
+    def wait_for_frame(self, last_seq: int = 0, timeout: float = 1.0) -> Tuple[int, Optional[bytes]]:
+        """
+        Block until a frame newer than last_seq is published.
+        Returns: (seq, frame_bytes), with frame_bytes None if none arrived within timeout
+        """
+        self._note_consumer()
+        # Take the event before checking the slot: a publish in between
+        # has already set this event, so the wakeup can't be missed
+        event = self._frame_event
+        seq, frame, _ = self._latest
+        # A cleared slot (paused, disconnected) keeps its sequence, so wait on
+        # it too rather than hand callers an empty result they'd spin on
+        if seq == last_seq or frame is None:
+            event.wait(timeout)
+            seq, frame, _ = self._latest
+        
+        if seq == last_seq or frame is None:
+            return last_seq, None
+        return seq, frame
     
     def get_frame(self) -> Tuple[bool, Optional[bytes]]:
         """
@@ -204,60 +723,187 @@ class CameraManager:
         Returns: (success, frame_bytes)
         """
         try:
-            with self.frame_lock:
-                if self.current_frame is None:
-                    logger.debug("No frame available")
-                    return False, None
-                
-                # Convert frame to JPEG
-                ret, buffer = cv2.imencode('.jpg', self.current_frame)
-                if not ret:
-                    logger.debug("Failed to encode frame as JPEG")
-                    return False, None
-                
-                logger.debug("Frame captured and encoded successfully")
-                return True, buffer.tobytes()
+            self._note_consumer()
+            # Frames arrive already encoded by the camera
+            frame = self._read_frame()
+            if frame is None:
+                logger.debug("No frame available")
+                return False, None
+            
+            return True, frame
                 
         except Exception as e:
             self.connection_error = str(e)
             logger.error(f"Error in get_frame: {e}")
             return False, None
+
+    def capture_still(self) -> Tuple[bool, str]:
+        """
+        Save the most recent frame as a JPEG in CAPTURE_DIR.
+        Returns: (success, filename or error message)
+        """
+        try:
+            if not self.is_connected:
+                return False, "Camera not connected"
+            
+            self._note_consumer()
+            seq, save_frame, _ = self._latest
+            if save_frame is None:
+                # Paused or just resuming: wait for the first frame published
+                # after the restart, allowing for the sensor to start up
+                _, save_frame = self.wait_for_frame(seq, timeout=5.0)
+            if save_frame is None:
+                return False, "No frame available"
+
+            # The frame is already a JPEG; write it with a single syscall
+            os.makedirs(CAPTURE_DIR, exist_ok=True)
+            # Names only go down to the second, so a second capture within it
+            # gets a counter suffix; O_EXCL keeps it from replacing the first
+            stem = f"capture_{time.strftime('%Y%m%d_%H%M%S')}"
+            filename = f"{stem}.jpg"
+            suffix = 1
+            while True:
+                try:
+                    fd = os.open(os.path.join(CAPTURE_DIR, filename), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                    break
+                except FileExistsError:
+                    filename = f"{stem}_{suffix}.jpg"
+                    suffix += 1
+            try:
+                os.write(fd, save_frame)
+            finally:
+                os.close(fd)
+
+            logger.info(f"Captured still: {filename}")
+            return True, filename
+
+        except Exception as e:
+            logger.error(f"Error in capture_still: {e}")
+            return False, str(e)
+
+    def toggle_recording(self) -> Tuple[bool, str]:
+        """
+        Start or stop recording to CAPTURE_DIR.
+        Returns: (success, filename or error message)
+        """
+        with self._rec_transition_lock:
+            if self.is_recording:
+                return self._stop_recording()
+            return self._start_recording()
+
+    def _start_recording(self) -> Tuple[bool, str]:
+        """Open the output file and start the writer thread. Caller holds _rec_transition_lock."""
+        try:
+            if not self.is_connected:
+                return False, "Camera not connected"
+            
+            # The camera already delivers JPEGs, so the recording is the raw
+            # MJPEG stream with no re-encode
+            os.makedirs(CAPTURE_DIR, exist_ok=True)
+            filename = f"recording_{time.strftime('%Y%m%d_%H%M%S')}.mjpeg"
+            writer = open(os.path.join(CAPTURE_DIR, filename), 'wb')
+            
+            frames = queue.SimpleQueue()
+            self._rec_thread = threading.Thread(target=self._record_loop, args=(writer, frames))
+            self._rec_thread.daemon = True
+            self._rec_thread.start()
+            
+            with self._rec_state_lock:
+                self.recording_filename = filename
+                self.is_recording = True
+            self._rec_queue = frames
+            self._note_consumer()  # Recording keeps the camera awake
+            
+            logger.info(f"Started recording: {filename}")
+            return True, filename
+            
+        except Exception as e:
+            logger.error(f"Error starting recording: {e}")
+            return False, str(e)
+
+    def _stop_recording(self) -> Tuple[bool, str]:
+        """Stop the writer thread and close the file. Caller holds _rec_transition_lock."""
+        frames = self._rec_queue
+        self._rec_queue = None
+        with self._rec_state_lock:
+            self.is_recording = False
+            filename = self.recording_filename
+            self.recording_filename = None
+        
+        if frames is not None:
+            frames.put(None)  # Sentinel: writer drains what is queued, then exits
+        if self._rec_thread:
+            self._rec_thread.join(timeout=5.0)
+            self._rec_thread = None
+        
+        logger.info(f"Stopped recording: {filename}")
+        return True, filename
+
+    def _record_loop(self, writer, frames: queue.SimpleQueue):
+        """Writer thread: the only place that touches the recording file."""
+        try:
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    break
+                writer.write(frame)
+        except Exception as e:
+            logger.error(f"Error in record loop: {e}")
+        finally:
+            writer.close()
+
+    def set_jpeg_quality(self, quality: int) -> Tuple[bool, str]:
+        """
+        Set the JPEG quality; takes effect the next time the camera connects.
+        Returns: (success, message)
+        """
+        if not 1 <= quality <= 100:
+            return False, "JPEG quality must be between 1 and 100"
+        self.jpeg_quality = quality
+        logger.info(f"JPEG quality set to {quality}")
+        return True, f"JPEG quality set to {quality}"
     
     def get_status(self) -> dict:
         """Get the current status of the camera."""
+        with self._rec_state_lock:
+            recording_status = {
+                'is_recording': self.is_recording,
+                'filename': self.recording_filename
+            }
         return {
             'connected': self.is_connected,
             'error': self.connection_error,
             'frame_width': self.frame_width,
             'frame_height': self.frame_height,
             'fps': self.fps,
-            'camera_type': 'libcamera-vid'
+            'idle': self.is_idle,
+            'jpeg_quality': self.jpeg_quality,
+            'camera_type': self.camera.name if self.camera is not None else None,
+            'recording_status': recording_status
         }
 
     def _cleanup_camera_object(self):
          """Safely close/release the current camera object"""
          if self.camera:
-             camera_type_to_clean = "OpenCV"
-             logger.info(f"Cleaning up {camera_type_to_clean} object...")
+             logger.info(f"Cleaning up {self.camera.name} backend...")
              try:
-                 self.camera.release()
+                 # Returns once the device is actually released, so no settling delay
+                 self.camera.stop()
                  logger.info("Camera released.")
              except Exception as e:
                  logger.error(f"Error during camera object cleanup: {e}")
              
              self.camera = None # Set to None regardless of cleanup success
-             # --- Explicit Garbage Collection --- 
-             logger.info("Running garbage collection...")
-             gc.collect()
-             # --- Add Delay Here --- 
-             logger.info("Waiting briefly after camera cleanup...")
-             time.sleep(1.5) # Give 1.5 seconds for resource release
-         else:
-             pass
+             self._clear_frame() # Drop the last frame's reference
 
     def cleanup(self):
         """Clean up all resources"""
         logger.info("Cleaning up camera manager...")
+        # Finish the recording first so its writer flushes and closes the file
+        with self._rec_transition_lock:
+            if self.is_recording:
+                self._stop_recording()
+        
         self.is_running = False
         if hasattr(self, 'capture_thread') and self.capture_thread:
             logger.info("Waiting for capture thread to finish...")
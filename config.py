@@ -1,9 +1,26 @@
 import os
+import platform
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+DEVICE_TREE_MODEL = '/proc/device-tree/model'
+
+def _detect_raspberry_pi() -> bool:
+    """Check the device-tree model, which 32- and 64-bit Pi OS both expose."""
+    if platform.system() != 'Linux':
+        return False
+    # A missing file just fails the open, so no separate exists() stat
+    try:
+        with open(DEVICE_TREE_MODEL, 'rb') as f:
+            return b'raspberry pi' in f.read().lower()
+    except OSError:
+        return False
+
+# Detected once at import so the camera and servo code always agree
+IS_RASPBERRY_PI = _detect_raspberry_pi()
+
 # Screen dimensions
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
@@ -19,6 +36,42 @@ PWM_FREQ = 50  # Standard 50Hz for servos
 # Joystick settings
 JOYSTICK_DEADZONE = 0.1  # 10% deadzone to prevent servo jitter
 
+# Joystick axes driving each servo
+HORIZONTAL_AXIS = int(os.environ.get('JOYSTICK_HORIZONTAL_AXIS', 0))  # Left stick horizontal
+VERTICAL_AXIS = int(os.environ.get('JOYSTICK_VERTICAL_AXIS', 1))  # Left stick vertical
+FOCUS_AXIS = int(os.environ.get('JOYSTICK_FOCUS_AXIS', 3))  # Right stick vertical
+
 # Display settings
 DISPLAY_CAPTION = "Servo Controller with Camera"
-FRAME_RATE = 60 
\ No newline at end of file
+FRAME_RATE = 60 
+
+# V4L2 webcam index used when no Raspberry Pi camera is present; unset to
+# pick the first capture device listed in sysfs
+CAMERA_DEVICE = int(os.environ['CAMERA_DEVICE']) if os.environ.get('CAMERA_DEVICE') else None
+
+# Seconds without a frame reader before the camera is paused
+CAMERA_IDLE_TIMEOUT = 2.0
+
+# Directory for captured stills and recordings
+CAPTURE_DIR = "captures"
+
+# JPEG quality for streamed frames (75-80 looks the same as 95 at a fraction of the cost)
+JPEG_QUALITY = int(os.environ.get('JPEG_QUALITY', 80))
+
+# OpenCV's imwrite flag values, which are fixed across releases; spelled out
+# so config doesn't pull in cv2 for the modules that never encode
+IMWRITE_JPEG_QUALITY = 1
+IMWRITE_JPEG_PROGRESSIVE = 2
+IMWRITE_JPEG_OPTIMIZE = 3
+IMWRITE_JPEG_SAMPLING_FACTOR = 7
+IMWRITE_JPEG_SAMPLING_FACTOR_420 = 0x221111
+
+def jpeg_params(quality: int) -> list:
+    """cv2.imencode params for streamed JPEGs: 4:2:0 chroma, no Huffman optimisation pass, baseline only."""
+    return [IMWRITE_JPEG_QUALITY, quality,
+            IMWRITE_JPEG_SAMPLING_FACTOR, IMWRITE_JPEG_SAMPLING_FACTOR_420,
+            IMWRITE_JPEG_OPTIMIZE, 0,
+            IMWRITE_JPEG_PROGRESSIVE, 0]
+
+# Software JPEG settings shared by every encoder running at JPEG_QUALITY
+JPEG_PARAMS = jpeg_params(JPEG_QUALITY)
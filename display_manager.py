@@ -1,46 +1,100 @@
+import functools
 import pygame
 import numpy as np
 from config import SCREEN_WIDTH, SCREEN_HEIGHT, DISPLAY_CAPTION
 
 class DisplayManager:
     def __init__(self):
-        # Initialize display
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Initialize display. HWSURFACE is only honoured by some SDL backends
+        # but costs nothing to request; DOUBLEBUF still works with the
+        # dirty-rect updates below
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT),
+                                              pygame.DOUBLEBUF | pygame.HWSURFACE)
         pygame.display.set_caption(DISPLAY_CAPTION)
         
         # Initialize font for status text
         self.font = pygame.font.Font(None, 36)
+        # Status lines rarely change, so keep their rendered surfaces
+        self._render_text = functools.lru_cache(maxsize=128)(
+            lambda text: self.font.render(text, True, (255, 255, 255)))
         
         # Create a clock for frame rate control
         self.clock = pygame.time.Clock()
+        
+        # Camera surface reused across frames, recreated only when the frame size changes
+        self._cam_surface = None
+        
+        # Only the camera area and the status strip are redrawn each frame;
+        # the strip fits the six status lines at 30px each
+        self._cam_rect = None
+        self._hud_rect = pygame.Rect(0, 0, SCREEN_WIDTH, 10 + 6 * 30)
+        
+        # Status text pre-rendered onto one transparent panel allocated once;
+        # only lines whose text changed are redrawn into their 30px slot
+        self._status_key = None
+        self._status_lines = []
+        self._status_panel = pygame.Surface(self._hud_rect.size, pygame.SRCALPHA)
     
     def update_display(self, frame, camera_connected, input_manager, servo_positions):
-        """Update the display with camera feed and status information"""
-        # Clear screen
-        self.screen.fill((0, 0, 0))
+        """
+        Update the display with camera feed and status information.
+        frame is a row-major (height, width, 3) RGB array, as cameras and OpenCV produce.
+        """
+        # Clear the status strip; the rest of the screen only changes under the camera
+        self.screen.fill((0, 0, 0), self._hud_rect)
+        dirty = [self._hud_rect]
+        
+        # Blank the old camera area if the feed went away or changed size
+        size = (frame.shape[1], frame.shape[0]) if frame is not None else None
+        if self._cam_rect is not None and self._cam_rect.size != size:
+            self.screen.fill((0, 0, 0), self._cam_rect)
+            dirty.append(self._cam_rect)
+            self._cam_rect = None
         
         # Draw camera feed if available
         if frame is not None:
-            # Convert numpy array to pygame surface
-            camera_surface = pygame.surfarray.make_surface(frame)
-            self.screen.blit(camera_surface, (0, 0))
+            # Copy the numpy array into the persistent surface in place. The
+            # surface is row-major too, so the swapped-axes view is just the
+            # (width, height) indexing surfarray expects and the copy runs
+            # through memory in order, with no transpose
+            if self._cam_surface is None or self._cam_surface.get_size() != size:
+                self._cam_surface = pygame.Surface(size)
+            pygame.surfarray.blit_array(self._cam_surface, frame.swapaxes(0, 1))
+            self._cam_rect = self.screen.blit(self._cam_surface, (0, 0))
+            dirty.append(self._cam_rect)
+        
+        # Rebuild the status panel only when a displayed value changed
+        status_key = (camera_connected, input_manager.connected, input_manager.error,
+                      round(servo_positions['horizontal'], 2),
+                      round(servo_positions['vertical'], 2),
+                      round(servo_positions['focus'], 2))
+        if status_key != self._status_key:
+            self._status_key = status_key
+            
+            status_text = []
+            status_text.append(f"Camera: {'Connected' if camera_connected else 'Disconnected'}")
+            status_text.append(f"Controls: {'Joystick' if input_manager.connected else 'Keyboard'}")
+            if input_manager.error:
+                status_text.append(f"Input Error: {input_manager.error}")
+            status_text.append(f"Horizontal: {servo_positions['horizontal']:.2f}")
+            status_text.append(f"Vertical: {servo_positions['vertical']:.2f}")
+            status_text.append(f"Focus: {servo_positions['focus']:.2f}")
+            
+            for i in range(max(len(status_text), len(self._status_lines))):
+                text = status_text[i] if i < len(status_text) else None
+                if i < len(self._status_lines) and self._status_lines[i] == text:
+                    continue
+                self._status_panel.fill((0, 0, 0, 0), (0, 10 + i * 30, self._hud_rect.width, 30))
+                if text is not None:
+                    text_surface = self._render_text(text)
+                    self._status_panel.blit(text_surface, (10, 10 + i * 30))
+            self._status_lines = status_text
         
         # Draw status text
-        status_text = []
-        status_text.append(f"Camera: {'Connected' if camera_connected else 'Disconnected'}")
-        status_text.append(f"Controls: {'Joystick' if input_manager.connected else 'Keyboard'}")
-        if input_manager.error:
-            status_text.append(f"Input Error: {input_manager.error}")
-        status_text.append(f"Horizontal: {servo_positions['horizontal']:.2f}")
-        status_text.append(f"Vertical: {servo_positions['vertical']:.2f}")
-        status_text.append(f"Focus: {servo_positions['focus']:.2f}")
-        
-        for i, text in enumerate(status_text):
-            text_surface = self.font.render(text, True, (255, 255, 255))
-            self.screen.blit(text_surface, (10, 10 + i * 30))
-        
-        # Update display
-        pygame.display.flip()
+        self.screen.blit(self._status_panel, self._hud_rect)
+        
+        # Push only the changed areas instead of flipping the whole screen
+        pygame.display.update(dirty)
     
     def limit_fps(self, fps):
         """Limit the frame rate"""
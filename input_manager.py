@@ -1,8 +1,21 @@
 import logging
+import os
 import platform
-import threading
 import time
-from typing import Optional
+from typing import Any, Dict, Optional
+from config import IS_RASPBERRY_PI, FRAME_RATE, JOYSTICK_DEADZONE, HORIZONTAL_AXIS, VERTICAL_AXIS, FOCUS_AXIS
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+# Events the input loop handles: axes, buttons and joystick hotplug
+INPUT_EVENTS = (pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP,
+                pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED) if pygame else ()
+
+# Buttons reported in the web UI's controller status
+MONITORED_BUTTONS = (0, 3)
 
 # Configure logging
 logging.basicConfig(
@@ -12,120 +25,203 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class InputManager:
+    # Idle wait per round, backed off while no events arrive. Events wake the
+    # wait at once, so this only bounds how soon a stop is noticed
+    min_idle_wait_ms = 10
+    max_idle_wait_ms = 250
+    
     def __init__(self, servo_controller):
         self.servo_controller = servo_controller
         self.is_running = False
-        self.thread: Optional[threading.Thread] = None
-        self.is_raspberry_pi = (platform.system() == 'Linux' and 
-                               platform.machine().startswith('arm'))
+        self.is_raspberry_pi = IS_RASPBERRY_PI
         
-        # Initialize pygame if not already initialized
         self.has_joystick = False
-        try:
-            import pygame
-            if not pygame.get_init():
-                pygame.init()
+        self.joystick = None
+        
+        # Axis values as last reported by JOYAXISMOTION events, so reading
+        # them never calls into SDL. Sized for the configured axes even when
+        # no joystick is attached, and grown to fit one when it connects
+        self._axes = [0.0] * (max(HORIZONTAL_AXIS, VERTICAL_AXIS, FOCUS_AXIS) + 1)
+        # Pressed buttons as bits of one int (bit n set while button n is down)
+        self._button_mask = 0
+        # MONITORED_BUTTONS the connected joystick actually has, worked out once at connect
+        self._monitored_buttons = ()
+        
+        # Initialize only the pygame modules input needs: the display module
+        # owns the event queue, and nothing else (audio, fonts) is used here
+        if pygame is None:
+            logger.warning("Pygame not available, using mock joystick")
+        else:
+            # Without a desktop session, use SDL's dummy video driver rather
+            # than probing X11/KMS; the event queue works the same
+            if (platform.system() == 'Linux' and
+                    not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY')):
+                os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            if not pygame.display.get_init():
+                pygame.display.init()
+            # Have SDL drop every event the input loop doesn't handle before
+            # it reaches Python or wakes the loop
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(INPUT_EVENTS)
             if not pygame.joystick.get_init():
                 pygame.joystick.init()
             
-            # Try to initialize joystick
+            # Try to initialize joystick; one plugged in later arrives as a
+            # JOYDEVICEADDED event instead of being polled for
             if pygame.joystick.get_count() > 0:
-                self.joystick = pygame.joystick.Joystick(0)
-                self.joystick.init()
-                self.has_joystick = True
-                logger.info(f"Joystick initialized: {self.joystick.get_name()}")
+                self._connect_joystick(0)
             else:
                 logger.warning("No joystick found")
-                self.joystick = None
-        except ImportError:
-            logger.warning("Pygame not available, using mock joystick")
-            self.joystick = None
         
-        # Initialize mock joystick values for non-Raspberry Pi systems
-        self.mock_horizontal = 0.0
-        self.mock_vertical = 0.0
-        self.mock_focus = 0.0
+        # SDL is pumped at most once per display frame
+        self._pump_interval_ns = 1_000_000_000 // FRAME_RATE
+        self._last_pump_ns = 0
+        self._idle_wait_ms = self.min_idle_wait_ms
+        
+        # Status snapshot for other threads. The input loop builds a fresh
+        # dict and swaps it in with one assignment, so readers never lock
+        # and never see a half-updated state
+        self._status: Dict[str, Any] = {}
+        self._publish_status()
+    
+    def _publish_status(self, error: Optional[str] = None) -> None:
+        """Replace the status snapshot read by get_status()."""
+        self._status = {
+            'connected': self.has_joystick,
+            'controller_type': 'Joystick' if self.has_joystick else 'Keyboard',
+            'error': error,
+            'raw_values': {
+                'axis_h': self._axes[HORIZONTAL_AXIS],
+                'axis_v': self._axes[VERTICAL_AXIS],
+                'axis_f': self._axes[FOCUS_AXIS],
+                'buttons': {button: bool(self._button_mask >> button & 1) for button in self._monitored_buttons}
+            }
+        }
+    
+    def _connect_joystick(self, index: int) -> None:
+        """Open the joystick at the given device index and size the axis cache for it."""
+        self.joystick = pygame.joystick.Joystick(index)
+        self.joystick.init()
+        self.has_joystick = True
+        num_axes = self.joystick.get_numaxes()
+        missing_axes = num_axes - len(self._axes)
+        if missing_axes > 0:
+            self._axes.extend([0.0] * missing_axes)
+        # Seed the cache with where the sticks are now; SDL only sends
+        # JOYAXISMOTION once they move
+        for axis in range(num_axes):
+            self._axes[axis] = self.joystick.get_axis(axis)
+        num_buttons = self.joystick.get_numbuttons()
+        self._monitored_buttons = tuple(button for button in MONITORED_BUTTONS if button < num_buttons)
+        logger.info(f"Joystick initialized: {self.joystick.get_name()}")
+    
+    def _disconnect_joystick(self) -> None:
+        """Release the unplugged joystick and centre its cached axes."""
+        logger.warning(f"Joystick disconnected: {self.joystick.get_name()}")
+        self.joystick.quit()
+        self.joystick = None
+        # Its last axis values would otherwise keep steering the servos and
+        # show up in the status
+        self._axes[:] = [0.0] * len(self._axes)
+        self.has_joystick = False
+        self._button_mask = 0
+        self._monitored_buttons = ()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the latest input status without locking; treat it as read-only."""
+        return self._status
     
-    def _apply_deadzone(self, value: float, deadzone: float = 0.1) -> float:
-        """Apply deadzone to joystick value."""
-        if abs(value) < deadzone:
-            return 0.0
-        return value
+    def _process_joystick_input(self, timeout_ms: int) -> bool:
+        """Wait for joystick events and update servo positions. Returns False if none arrived."""
+        if pygame is None:
+            time.sleep(timeout_ms / 1000)  # Nothing to wait on; don't spin the caller
+            return False
+        
+        # Sleep in SDL until an event arrives; the timeout lets tick()'s caller
+        # notice a stop
+        event = pygame.event.wait(timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return False
+        
+        # Let a fast joystick's events pile up until the frame is over, so a
+        # burst costs one pump and one set of servo writes
+        remaining_ns = self._last_pump_ns + self._pump_interval_ns - time.monotonic_ns()
+        slept = remaining_ns > 0
+        if slept:
+            time.sleep(remaining_ns / 1e9)
+        self._last_pump_ns = time.monotonic_ns()
+        
+        # Process the event that woke us and drain the burst queued behind it
+        # in one batch, taking only the types handled here so any others stay
+        # queued for whoever owns them. Lookups are hoisted out of the loop
+        axis_motion = pygame.JOYAXISMOTION
+        axes = self._axes
+        num_axes = len(axes)
+        # The wait above just pumped SDL, so only pump again if we slept since
+        for event in [event] + pygame.event.get(INPUT_EVENTS, pump=slept):
+            if event.type == axis_motion:
+                if event.axis < num_axes:
+                    axes[event.axis] = event.value
+            elif event.type == pygame.JOYBUTTONDOWN:
+                self._button_mask |= 1 << event.button
+            elif event.type == pygame.JOYBUTTONUP:
+                self._button_mask &= ~(1 << event.button)
+            elif event.type == pygame.JOYDEVICEADDED:
+                # SDL also announces joysticks that were present at startup
+                if self.joystick is None:
+                    self._connect_joystick(event.device_index)
+                    num_axes = len(axes)
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                if self.joystick is not None and event.instance_id == self.joystick.get_instance_id():
+                    self._disconnect_joystick()
+        
+        # Read all axes at once from the event-fed cache
+        axes = (self._axes[HORIZONTAL_AXIS], self._axes[VERTICAL_AXIS], self._axes[FOCUS_AXIS])
+        
+        # Apply the deadzone and convert -1.0 to 1.0 range to 0 to 180 degrees in one pass
+        h_pos, v_pos, f_pos = [int((a + 1.0) * 90) if abs(a) >= JOYSTICK_DEADZONE else 90 for a in axes]
+        
+        # Update all servo positions in one call, skipping the write when the
+        # servos are already there (e.g. a stick resting in its deadzone)
+        controller = self.servo_controller
+        if (h_pos, v_pos, f_pos) != (controller.horizontal_pos, controller.vertical_pos, controller.focus_pos):
+            controller.update_positions(h_pos, v_pos, f_pos)
+        self._publish_status()
+        return True
     
-    def _process_joystick_input(self) -> None:
-        """Process joystick input and update servo positions."""
+    def tick(self) -> None:
+        """
+        Process one round of input, woken by SDL events rather than a fixed poll.
+        Called from the main thread's loop, which owns pygame's event queue.
+        """
+        if not self.is_running:
+            return
         try:
-            import pygame
-            
-            # Process pygame events
-            for event in pygame.event.get():
-                if event.type == pygame.JOYAXISMOTION:
-                    if event.axis == 0:  # Left stick horizontal
-                        self.mock_horizontal = self._apply_deadzone(event.value)
-                    elif event.axis == 1:  # Left stick vertical
-                        self.mock_vertical = self._apply_deadzone(event.value)
-                    elif event.axis == 3:  # Right stick vertical (focus)
-                        self.mock_focus = self._apply_deadzone(event.value)
-            
-            # Update servo positions
-            if self.joystick:
-                horizontal = self._apply_deadzone(self.joystick.get_axis(0))
-                vertical = self._apply_deadzone(self.joystick.get_axis(1))
-                focus = self._apply_deadzone(self.joystick.get_axis(3))
+            # Snap back to short waits on activity, back off while idle
+            if self._process_joystick_input(self._idle_wait_ms):
+                self._idle_wait_ms = self.min_idle_wait_ms
             else:
-                # Use mock values
-                horizontal = self.mock_horizontal
-                vertical = self.mock_vertical
-                focus = self.mock_focus
-            
-            # Convert -1.0 to 1.0 range to 0 to 180 degrees
-            h_pos = int((horizontal + 1.0) * 90)
-            v_pos = int((vertical + 1.0) * 90)
-            f_pos = int((focus + 1.0) * 90)
-            
-            # Update servo positions
-            self.servo_controller.update_position('horizontal', h_pos)
-            self.servo_controller.update_position('vertical', v_pos)
-            self.servo_controller.update_position('focus', f_pos)
-            
+                self._idle_wait_ms = min(self._idle_wait_ms * 3 // 2, self.max_idle_wait_ms)
         except Exception as e:
-            logger.error(f"Error processing joystick input: {e}")
-    
-    def run(self) -> None:
-        """Main input processing loop."""
-        logger.info("Starting input manager")
-        while self.is_running:
-            try:
-                self._process_joystick_input()
-                time.sleep(0.01)  # 100Hz update rate
-            except Exception as e:
-                logger.error(f"Error in input manager loop: {e}")
-                time.sleep(1)  # Wait longer on error
+            logger.error(f"Error in input manager loop: {e}")
+            self._publish_status(str(e))
+            time.sleep(1)  # Wait longer on error
     
     def start(self) -> None:
-        """Start the input manager in a background thread."""
+        """Start accepting input; the caller drives it with tick()."""
         if not self.is_running:
             self.is_running = True
-            self.thread = threading.Thread(target=self.run)
-            self.thread.daemon = True
-            self.thread.start()
             logger.info("Input manager started")
     
     def stop(self) -> None:
         """Stop the input manager."""
-        self.is_running = False
-        if self.thread:
-            self.thread.join(timeout=1.0)
-            self.thread = None
+        if self.is_running:
+            self.is_running = False
             logger.info("Input manager stopped")
     
     def cleanup(self) -> None:
         """Clean up resources."""
         self.stop()
-        try:
-            import pygame
-            if pygame.get_init():
-                pygame.quit()
-        except ImportError:
-            pass
+        if pygame is not None:
+            pygame.quit()  # Shuts down whichever modules were initialized
         logger.info("Input manager cleaned up") 
\ No newline at end of file
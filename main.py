@@ -50,9 +50,11 @@ class Application:
             
             logger.info("Application started successfully")
             
-            # Wait for shutdown signal
+            # Input runs on the main thread, which owns pygame's event queue,
+            # until a shutdown signal clears is_running
+            input_manager = self.input_manager
             while self.is_running:
-                signal.pause()
+                input_manager.tick()
                 
         except Exception as e:
             logger.error(f"Error starting application: {e}")
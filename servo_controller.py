@@ -1,7 +1,7 @@
 import logging
-import platform
 import threading
 from typing import Dict, Any
+from config import IS_RASPBERRY_PI
 
 # Configure logging
 logging.basicConfig(
@@ -12,8 +12,7 @@ logger = logging.getLogger(__name__)
 
 class ServoController:
     def __init__(self):
-        self.is_raspberry_pi = (platform.system() == 'Linux' and 
-                               platform.machine().startswith('arm'))
+        self.is_raspberry_pi = IS_RASPBERRY_PI
         
         # Initialize positions
         self.horizontal_pos = 90
@@ -27,8 +26,14 @@ class ServoController:
         # Initialize connection status
         self.is_connected = False
         
+        # Duty cycle last written to each PWM, so unchanged targets skip the GPIO call
+        self._last_duty = {'horizontal': None, 'vertical': None, 'focus': None}
+        
         # Thread safety
         self.lock = threading.Lock()
+        # Bumped on every position update so readers can block for a change
+        self.version = 0
+        self._changed = threading.Condition(self.lock)
         
         if self.is_raspberry_pi:
             try:
@@ -63,28 +68,62 @@ class ServoController:
         """Update the position of a servo."""
         try:
             with self.lock:
-                if axis == 'horizontal':
-                    self.horizontal_pos = position
-                    if self.is_raspberry_pi:
-                        self.horizontal_pwm.ChangeDutyCycle(self._position_to_duty(position))
-                elif axis == 'vertical':
-                    self.vertical_pos = position
-                    if self.is_raspberry_pi:
-                        self.vertical_pwm.ChangeDutyCycle(self._position_to_duty(position))
-                elif axis == 'focus':
-                    self.focus_pos = position
-                    if self.is_raspberry_pi:
-                        self.focus_pwm.ChangeDutyCycle(self._position_to_duty(position))
-                else:
-                    raise ValueError(f"Invalid axis: {axis}")
-                
-                logger.debug(f"Updated {axis} position to {position}")
+                self._set_position(axis, position)
+                self.version += 1
+                self._changed.notify_all()
+                logger.debug("Updated %s position to %s", axis, position)
         except Exception as e:
             self.error_count += 1
             self.last_error = str(e)
             logger.error(f"Error updating {axis} position: {e}")
             raise
     
+    def update_positions(self, horizontal: int, vertical: int, focus: int) -> None:
+        """Update all three servos with one lock acquisition and one change notification."""
+        try:
+            with self.lock:
+                self._set_position('horizontal', horizontal)
+                self._set_position('vertical', vertical)
+                self._set_position('focus', focus)
+                self.version += 1
+                self._changed.notify_all()
+                logger.debug("Updated positions to %s, %s, %s", horizontal, vertical, focus)
+        except Exception as e:
+            self.error_count += 1
+            self.last_error = str(e)
+            logger.error(f"Error updating positions: {e}")
+            raise
+    
+    def wait_for_change(self, version: int, timeout: float = 1.0) -> int:
+        """Block until the positions move past the given version; returns the current version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+    
+    def _set_position(self, axis: str, position: int) -> None:
+        """Store one servo position and drive it if the GPIO came up. Caller holds the lock."""
+        if axis == 'horizontal':
+            self.horizontal_pos = position
+            if self.is_connected:
+                self._write_duty('horizontal', self.horizontal_pwm, position)
+        elif axis == 'vertical':
+            self.vertical_pos = position
+            if self.is_connected:
+                self._write_duty('vertical', self.vertical_pwm, position)
+        elif axis == 'focus':
+            self.focus_pos = position
+            if self.is_connected:
+                self._write_duty('focus', self.focus_pwm, position)
+        else:
+            raise ValueError(f"Invalid axis: {axis}")
+    
+    def _write_duty(self, axis: str, pwm, position: int) -> None:
+        """Reprogram a servo's PWM unless it already has that duty cycle. Caller holds the lock."""
+        duty = self._position_to_duty(position)
+        if duty != self._last_duty[axis]:
+            pwm.ChangeDutyCycle(duty)
+            self._last_duty[axis] = duty
+    
     def _position_to_duty(self, position: int) -> float:
         """Convert position (0-180) to duty cycle (0-100)."""
         return position / 18.0
@@ -1,5 +1,6 @@
 import RPi.GPIO as GPIO
 import time
+import logging
 from config import (
     HORIZONTAL_PIN, 
     VERTICAL_PIN, 
@@ -7,6 +8,8 @@ from config import (
     PWM_FREQ
 )
 
+logger = logging.getLogger(__name__)
+
 class ServoManager:
     def __init__(self):
         # Set up the Raspberry Pi GPIO
@@ -40,9 +43,6 @@ class ServoManager:
         # Error tracking
         self.error = None
         self.connected = True
-        
-        # Debug flag
-        self.debug = True
     
     def _setup_pins(self):
         """Set up GPIO pins for servos"""
@@ -83,8 +83,8 @@ class ServoManager:
                     self.horizontal_pwm.ChangeDutyCycle(new_duty)
                     self.last_horizontal_duty = new_duty
                     duty_changed = True
-                    if self.debug:
-                        print(f"Horizontal Update: {self.horizontal_pos:.2f} -> Duty: {new_duty:.2f}%")
+                    # Lazy %-args: nothing is formatted unless DEBUG is enabled
+                    logger.debug("Horizontal Update: %.2f -> Duty: %.2f%%", self.horizontal_pos, new_duty)
             
             # Vertical
             if vertical is not None:
@@ -95,8 +95,7 @@ class ServoManager:
                     self.vertical_pwm.ChangeDutyCycle(new_duty)
                     self.last_vertical_duty = new_duty
                     duty_changed = True
-                    if self.debug:
-                        print(f"Vertical Update: {self.vertical_pos:.2f} -> Duty: {new_duty:.2f}%")
+                    logger.debug("Vertical Update: %.2f -> Duty: %.2f%%", self.vertical_pos, new_duty)
 
             # Focus
             if focus is not None:
@@ -107,8 +106,7 @@ class ServoManager:
                     self.focus_pwm.ChangeDutyCycle(new_duty)
                     self.last_focus_duty = new_duty
                     duty_changed = True
-                    if self.debug:
-                        print(f"Focus Update: {self.focus_pos:.2f} -> Duty: {new_duty:.2f}%")
+                    logger.debug("Focus Update: %.2f -> Duty: %.2f%%", self.focus_pos, new_duty)
 
             # If any duty cycle was changed, give a tiny pause for stability (optional)
             # if duty_changed:
@@ -120,7 +118,7 @@ class ServoManager:
         except Exception as e:
             self.error = str(e)
             self.connected = False
-            print(f"Error updating servo position: {e}")
+            logger.error(f"Error updating servo position: {e}")
     
     def _value_to_duty(self, value):
         """Map from -1,1 range to PWM duty cycle (0-100) with proper pulse width"""
@@ -158,4 +156,4 @@ class ServoManager:
             self.focus_pwm.stop()
             GPIO.cleanup()
         except Exception as e:
-            print(f"Error during cleanup: {e}") 
\ No newline at end of file
+            logger.error(f"Error during cleanup: {e}") 
\ No newline at end of file
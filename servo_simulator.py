@@ -80,10 +80,17 @@ font = pygame.font.Font(None, 36)
 
 # Camera Configuration
 USE_WEBCAM = True  # Try to use local webcam
+# GStreamer pipeline that hands over raw YUY2 at display size, skipping the
+# MJPEG decode + BGR conversion + resize of the default V4L2 backend
+WEBCAM_PIPELINE = (f"v4l2src device=/dev/video0 ! "
+                   f"video/x-raw,format=YUY2,width={SCREEN_WIDTH},height={SCREEN_HEIGHT},framerate=30/1 ! "
+                   f"appsink drop=1 max-buffers=2")
 SIMULATE_CAMERA = True  # Generate a simulated view if webcam fails
 camera_connected = False
-frame = None
-frame_lock = threading.Lock()
+# Latest (frame, pixel_format) pair. The camera thread builds each frame
+# privately and publishes it with one assignment, which is atomic, so the
+# display loop never waits on a lock
+latest_frame = None
 
 # Simulated servo positions (for visual feedback)
 servo_h_pos = 0.5  # 0 to 1 range (center = 0.5)
@@ -117,12 +124,32 @@ def map_to_servo_pos(value):
 
 # Function to capture frames from the webcam or generate simulated views
 def camera_thread():
-    global frame, camera_connected, servo_h_pos, servo_v_pos, focus_level
+    global latest_frame, camera_connected, servo_h_pos, servo_v_pos, focus_level
     
     # Try to connect to webcam if enabled
     if USE_WEBCAM:
         try:
-            cap = cv2.VideoCapture(0)  # Use default camera (usually webcam)
+            # Prefer the YUY2 GStreamer pipeline; fall back to the default backend
+            cap = cv2.VideoCapture(WEBCAM_PIPELINE, cv2.CAP_GSTREAMER)
+            if cap.isOpened():
+                color_conversion = cv2.COLOR_YUV2RGB_YUY2
+                webcam_format = 'RGB'
+                needs_resize = False
+            else:
+                cap = cv2.VideoCapture(0)  # Use default camera (usually webcam)
+                # Ask the driver for display-sized frames so scaling happens on
+                # the device; only fall back to cv2.resize if it refuses
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, SCREEN_WIDTH)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, SCREEN_HEIGHT)
+                # Keep a single buffered frame so read() blocks for the next one
+                # instead of handing back a stale backlog
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                # pygame can take BGR directly, so no colour conversion here
+                color_conversion = None
+                webcam_format = 'BGR'
+                needs_resize = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) != SCREEN_WIDTH or
+                                int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) != SCREEN_HEIGHT)
+            
             if cap.isOpened():
                 camera_connected = True
                 print("Webcam connected")
@@ -133,12 +160,12 @@ def camera_thread():
                         print("Failed to get webcam frame")
                         break
                     
-                    with frame_lock:
-                        # Convert to RGB for Pygame
-                        frame = cv2.cvtColor(new_frame, cv2.COLOR_BGR2RGB)
+                    # Single pass from YUY2 on the GStreamer path; BGR frames are used as-is
+                    frame = new_frame if color_conversion is None else cv2.cvtColor(new_frame, color_conversion)
+                    if needs_resize:
                         frame = cv2.resize(frame, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                    
-                    time.sleep(0.033)  # ~30fps
+                    latest_frame = (frame, webcam_format)
+                    # No sleep: cap.read() blocks until the camera delivers a frame
                 
                 cap.release()
         except Exception as e:
@@ -150,41 +177,48 @@ def camera_thread():
         print("Using simulated camera view")
         camera_connected = True
         
+        # The grid never changes, so draw it once and copy it each frame
+        grid_frame = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8)
+        for x in range(0, SCREEN_WIDTH, 50):
+            cv2.line(grid_frame, (x, 0), (x, SCREEN_HEIGHT), (30, 30, 30), 1)
+        for y in range(0, SCREEN_HEIGHT, 50):
+            cv2.line(grid_frame, (0, y), (SCREEN_WIDTH, y), (30, 30, 30), 1)
+        
         # Create a "camera view" with a grid and crosshair
+        last_view = None
         while True:
-            # Create a blank frame
-            new_frame = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8)
-            
-            # Add a grid
-            for x in range(0, SCREEN_WIDTH, 50):
-                cv2.line(new_frame, (x, 0), (x, SCREEN_HEIGHT), (30, 30, 30), 1)
-            for y in range(0, SCREEN_HEIGHT, 50):
-                cv2.line(new_frame, (0, y), (SCREEN_WIDTH, y), (30, 30, 30), 1)
-            
-            # Add a horizon line
-            horizon_y = int(SCREEN_HEIGHT * servo_v_pos)
-            cv2.line(new_frame, (0, horizon_y), (SCREEN_WIDTH, horizon_y), (0, 100, 0), 2)
-            
-            # Add a vertical line for horizontal servo position
-            vertical_x = int(SCREEN_WIDTH * servo_h_pos)
-            cv2.line(new_frame, (vertical_x, 0), (vertical_x, SCREEN_HEIGHT), (100, 0, 0), 2)
-            
-            # Draw a rectangle to represent the camera view boundaries
-            cv2.rectangle(new_frame, (100, 100), (SCREEN_WIDTH-100, SCREEN_HEIGHT-100), (50, 50, 100), 2)
-            
-            # Add crosshair in center
-            center_x = int(SCREEN_WIDTH * servo_h_pos)
-            center_y = int(SCREEN_HEIGHT * servo_v_pos)
-            cv2.line(new_frame, (center_x-20, center_y), (center_x+20, center_y), (200, 200, 0), 2)
-            cv2.line(new_frame, (center_x, center_y-20), (center_x, center_y+20), (200, 200, 0), 2)
-            
-            # Apply "blur" based on focus
-            blur_amount = int(abs(focus_level - 0.5) * 20) + 1
-            if blur_amount > 1:
-                new_frame = cv2.GaussianBlur(new_frame, (blur_amount*2+1, blur_amount*2+1), 0)
-            
-            with frame_lock:
-                frame = new_frame
+            # Only redraw when the simulated servos moved; drawing holds the GIL
+            # that the pygame loop needs, and an unchanged view is already published
+            view = (servo_h_pos, servo_v_pos, focus_level)
+            if view != last_view:
+                last_view = view
+                
+                # Start from a copy of the grid; published frames must not be reused
+                new_frame = grid_frame.copy()
+                
+                # Add a horizon line
+                horizon_y = int(SCREEN_HEIGHT * servo_v_pos)
+                cv2.line(new_frame, (0, horizon_y), (SCREEN_WIDTH, horizon_y), (0, 100, 0), 2)
+                
+                # Add a vertical line for horizontal servo position
+                vertical_x = int(SCREEN_WIDTH * servo_h_pos)
+                cv2.line(new_frame, (vertical_x, 0), (vertical_x, SCREEN_HEIGHT), (100, 0, 0), 2)
+                
+                # Draw a rectangle to represent the camera view boundaries
+                cv2.rectangle(new_frame, (100, 100), (SCREEN_WIDTH-100, SCREEN_HEIGHT-100), (50, 50, 100), 2)
+                
+                # Add crosshair in center
+                center_x = int(SCREEN_WIDTH * servo_h_pos)
+                center_y = int(SCREEN_HEIGHT * servo_v_pos)
+                cv2.line(new_frame, (center_x-20, center_y), (center_x+20, center_y), (200, 200, 0), 2)
+                cv2.line(new_frame, (center_x, center_y-20), (center_x, center_y+20), (200, 200, 0), 2)
+                
+                # Apply "blur" based on focus
+                blur_amount = int(abs(focus_level - 0.5) * 20) + 1
+                if blur_amount > 1:
+                    new_frame = cv2.GaussianBlur(new_frame, (blur_amount*2+1, blur_amount*2+1), 0)
+                
+                latest_frame = (new_frame, 'RGB')
             
             time.sleep(0.033)  # ~30fps
 
@@ -195,12 +229,22 @@ cam_thread.start()
 # Create a clock to control the frame rate
 clock = pygame.time.Clock()
 
+# Keyboard fallback: key -> (index into keyboard_values, step), so each key
+# press is one dict lookup instead of a walk down an if/elif chain
+KEY_STEPS = {
+    pygame.K_LEFT: (0, -0.1),
+    pygame.K_RIGHT: (0, 0.1),
+    pygame.K_UP: (1, -0.1),
+    pygame.K_DOWN: (1, 0.1),
+    pygame.K_a: (2, -0.1),
+    pygame.K_d: (2, 0.1),
+}
+
 try:
     running = True
     
-    horizontal_value = 0
-    vertical_value = 0
-    focus_value = 0
+    # Horizontal, vertical and focus values set from the keyboard
+    keyboard_values = [0, 0, 0]
     
     while running:
         # Process events
@@ -210,18 +254,10 @@ try:
             
             # Keyboard controls as fallback
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT:
-                    horizontal_value = max(-1, horizontal_value - 0.1)
-                elif event.key == pygame.K_RIGHT:
-                    horizontal_value = min(1, horizontal_value + 0.1)
-                elif event.key == pygame.K_UP:
-                    vertical_value = max(-1, vertical_value - 0.1)
-                elif event.key == pygame.K_DOWN:
-                    vertical_value = min(1, vertical_value + 0.1)
-                elif event.key == pygame.K_a:
-                    focus_value = max(-1, focus_value - 0.1)
-                elif event.key == pygame.K_d:
-                    focus_value = min(1, focus_value + 0.1)
+                step = KEY_STEPS.get(event.key)
+                if step is not None:
+                    index, delta = step
+                    keyboard_values[index] = max(-1, min(1, keyboard_values[index] + delta))
                 elif event.key == pygame.K_ESCAPE:
                     running = False
         
@@ -247,6 +283,8 @@ try:
             
             # Normalize to -1 to 1 range
             focus_value = max(-1, min(1, focus_value))
+        else:
+            horizontal_value, vertical_value, focus_value = keyboard_values
         
         # Update simulated servo positions for visualization
         servo_h_pos = map_to_servo_pos(horizontal_value)
@@ -267,11 +305,12 @@ try:
         screen.fill((0, 0, 0))
         
         # Render the camera feed if available
-        with frame_lock:
-            if frame is not None:
-                # Convert numpy array to pygame surface
-                camera_surface = pygame.surfarray.make_surface(frame)
-                screen.blit(camera_surface, (0, 0))
+        published = latest_frame
+        if published is not None:
+            frame, frame_format = published
+            # Wrap the row-major frame in a surface of its own pixel order, no conversion
+            camera_surface = pygame.image.frombuffer(frame, (frame.shape[1], frame.shape[0]), frame_format)
+            screen.blit(camera_surface, (0, 0))
         
         # Render status text
         status_text = []
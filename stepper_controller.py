@@ -35,13 +35,18 @@ pygame.joystick.init()
 joystick = pygame.joystick.Joystick(0)
 joystick.init()
 
-def step_motor(step_pin, dir_pin, direction, steps=1, delay=0.001):
-    """Control a stepper motor with direction and number of steps"""
-    GPIO.output(dir_pin, GPIO.HIGH if direction else GPIO.LOW)
-    for _ in range(steps):
-        GPIO.output(step_pin, GPIO.HIGH)
+def step_motors(moves, delay=0.001):
+    """Step several motors together; moves is a list of (step_pin, dir_pin, direction, steps)"""
+    for step_pin, dir_pin, direction, steps in moves:
+        GPIO.output(dir_pin, GPIO.HIGH if direction else GPIO.LOW)
+    
+    # Each pulse drives every motor that still has steps left with one
+    # GPIO call, so a move takes as long as the longest axis, not the sum
+    for i in range(max((steps for _, _, _, steps in moves), default=0)):
+        pins = [step_pin for step_pin, _, _, steps in moves if steps > i]
+        GPIO.output(pins, GPIO.HIGH)
         time.sleep(delay)
-        GPIO.output(step_pin, GPIO.LOW)
+        GPIO.output(pins, GPIO.LOW)
         time.sleep(delay)
 
 def map_to_steps(value, max_steps=10):
@@ -62,20 +67,15 @@ try:
         GPIO.output(V_EN_PIN, GPIO.LOW)
         GPIO.output(F_EN_PIN, GPIO.LOW)
 
-        # Control horizontal motor
+        # Collect the moves for every motor outside the dead zone and step them together
+        moves = []
         if abs(horizontal_axis) > 0.1:  # Dead zone
-            steps = map_to_steps(horizontal_axis)
-            step_motor(H_STEP_PIN, H_DIR_PIN, horizontal_axis > 0, steps)
-
-        # Control vertical motor
+            moves.append((H_STEP_PIN, H_DIR_PIN, horizontal_axis > 0, map_to_steps(horizontal_axis)))
         if abs(vertical_axis) > 0.1:  # Dead zone
-            steps = map_to_steps(vertical_axis)
-            step_motor(V_STEP_PIN, V_DIR_PIN, vertical_axis > 0, steps)
-
-        # Control focus motor
+            moves.append((V_STEP_PIN, V_DIR_PIN, vertical_axis > 0, map_to_steps(vertical_axis)))
         if abs(focus_axis) > 0.1:  # Dead zone
-            steps = map_to_steps(focus_axis)
-            step_motor(F_STEP_PIN, F_DIR_PIN, focus_axis > 0, steps)
+            moves.append((F_STEP_PIN, F_DIR_PIN, focus_axis > 0, map_to_steps(focus_axis)))
+        step_motors(moves)
 
         # Disable motors when not moving
         if abs(horizontal_axis) <= 0.1 and abs(vertical_axis) <= 0.1 and abs(focus_axis) <= 0.1:
@@ -0,0 +1,20 @@
+import time
+import unittest
+
+from camera_manager import CameraManager
+
+class WaitForFrameTest(unittest.TestCase):
+    def test_blocks_for_timeout_when_frame_cleared(self):
+        manager = CameraManager()
+        manager._latest = (5, b'\xff\xd8frame\xff\xd9', time.time())
+        manager._clear_frame()
+
+        start = time.monotonic()
+        seq, frame = manager.wait_for_frame(0, timeout=0.05)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual((seq, frame), (0, None))
+        self.assertGreaterEqual(elapsed, 0.04)
+
+if __name__ == '__main__':
+    unittest.main()
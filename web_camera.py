@@ -1,7 +1,5 @@
 import threading
-import time
 import os
-import cv2
 import pygame
 import asyncio
 import urllib.parse
@@ -11,7 +9,7 @@ from camera_manager import CameraManager
 from servo_manager import ServoManager
 from input_manager import InputManager
 from telegram_sender import send_photo_to_telegram
-from config import FRAME_RATE
+from config import CAPTURE_DIR
 
 # Handle XDG_RUNTIME_DIR issue on Raspberry Pi OS
 if not os.environ.get('XDG_RUNTIME_DIR'):
@@ -21,8 +19,6 @@ if not os.environ.get('XDG_RUNTIME_DIR'):
     os.makedirs(runtime_dir, exist_ok=True)
     os.environ['XDG_RUNTIME_DIR'] = runtime_dir
 
-CAPTURE_DIR = "captures"
-
 class WebCameraServer:
     def __init__(self, servo_manager: ServoManager, camera_manager: CameraManager, input_manager: InputManager, port=8080):
         self.app = Flask(__name__, template_folder='templates')
@@ -31,6 +27,9 @@ class WebCameraServer:
         self.camera_manager = camera_manager
         self.input_manager = input_manager
         
+        # (frame seq, multipart chunk) shared by all stream clients
+        self._part_cache = (0, None)
+        
         # Ensure captures directory exists (used by CameraManager too)
         os.makedirs(CAPTURE_DIR, exist_ok=True)
         self.app.config['CAPTURE_DIR'] = CAPTURE_DIR
@@ -894,41 +893,25 @@ class WebCameraServer:
 
     def _generate_frames(self):
         """Generate frames for MJPEG streaming"""
+        # CameraManager already holds JPEG bytes, so there is no colour
+        # conversion or re-encode; each client blocks until the next frame
+        # is published instead of polling
+        wait_for_frame = self.camera_manager.wait_for_frame
+        seq = 0
         while True:
-            # Get the latest frame from the camera manager
-            frame = self.camera_manager.get_frame() 
+            seq, frame_bytes = wait_for_frame(seq)
+            if frame_bytes is None:
+                continue  # No new frame yet (camera starting or disconnected)
             
-            if frame is not None:
-                processed_frame = frame # Assume BGR by default
-                # --- Convert PiCamera frame to BGR for JPEG encoding --- 
-                if self.camera_manager.camera_type == "Raspberry Pi Camera":
-                    try:
-                        # Frame from get_frame() should be RGB888 based on config
-                        # print("Converting frame to BGR for JPEG stream...") # Debug
-                        processed_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    except cv2.error as cv_err:
-                        print(f"OpenCV error during BGR conversion for streaming: {cv_err}")
-                        # Send a placeholder or skip frame?
-                        # For now, try to stream the original frame
-                        processed_frame = frame 
-                # --- End Conversion --- 
-                
-                # Encode as JPEG (expects BGR)
-                ret, buffer = cv2.imencode('.jpg', processed_frame)
-                if ret:
-                    frame_bytes = buffer.tobytes()
-                    # Yield for MJPEG streaming
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-                else:
-                     print("JPEG encoding failed.")
-            else:
-                # print("No frame available from camera manager.") # Debug
-                # Send a placeholder image if no frame? (optional)
-                pass # Or just wait
+            # The first client to see a frame builds its part; the rest reuse it
+            cached_seq, part = self._part_cache
+            if cached_seq != seq:
+                part = (b'--frame\r\n'
+                        b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+                self._part_cache = (seq, part)
             
-            # Adjust sleep time - maybe slightly longer if frames are slow
-            time.sleep(max(0.01, 1.0 / FRAME_RATE)) # Use FRAME_RATE from config
+            # Yield for MJPEG streaming
+            yield part
     
     def start(self):
         """Start the web server in a separate thread"""
@@ -1,21 +1,15 @@
 import os
-import sys
 import time
 import threading
 import logging
 import cv2
 import numpy as np
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from camera_manager import CameraManager
 from servo_controller import ServoController
 from input_manager import InputManager
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, FRAME_RATE
+from config import IS_RASPBERRY_PI, JPEG_PARAMS
 from dotenv import load_dotenv
-import json
-import base64
-from datetime import datetime
-import shutil
 import platform
+from concurrent.futures import ThreadPoolExecutor, Future
 from flask import Flask, Response, render_template, jsonify
 from typing import Optional, Tuple
 
@@ -42,6 +36,15 @@ class WebServer:
         self.is_running = False
         self.server_thread: Optional[threading.Thread] = None
         
+        # Mock frames are encoded off the request threads; viewers asking for
+        # the same servo positions share one pending encode. The pool only
+        # exists between start() and stop()
+        self._encode_pool: Optional[ThreadPoolExecutor] = None
+        self._encode_lock = threading.Lock()
+        self._encode_key: Optional[Tuple[int, int, int]] = None
+        self._encode_future: Optional[Future] = None
+        self._mock_background = self._build_mock_background()
+        
         # Set up routes
         self.app.route('/')(self.index)
         self.app.route('/video_feed')(self.video_feed)
@@ -128,38 +131,84 @@ class WebServer:
     def video_feed(self):
         """Generate mock video feed."""
         def generate():
+            last_positions = None
+            part = None
+            version = -1
             while self.is_running:
-                # Create a blank frame
-                frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                frame[:] = (0, 0, 255)  # Blue background
-                
-                # Add text
-                cv2.putText(frame, "No Camera Available", (50, 240),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-                cv2.putText(frame, "Using Mock Camera", (50, 280),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+                # Sleep until a servo moves rather than spinning; on timeout the
+                # last part is re-sent so the client still sees the stream alive
+                new_version = self.servo_controller.wait_for_change(version)
+                if new_version == version and part is not None:
+                    yield part
+                    continue
+                version = new_version
                 
-                # Add servo positions
                 status = self.servo_controller.get_status()
-                cv2.putText(frame, f"H: {status['horizontal']}°", (50, 320),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-                cv2.putText(frame, f"V: {status['vertical']}°", (50, 360),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-                cv2.putText(frame, f"F: {status['focus']}°", (50, 400),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+                positions = status['positions']
+                key = (positions['horizontal'], positions['vertical'], positions['focus'])
                 
-                # Encode frame
-                ret, buffer = cv2.imencode('.jpg', frame)
-                if not ret:
-                    continue
+                # Only render and encode again when a servo actually moved
+                if key != last_positions:
+                    # Parts are shared by every viewer at these positions
+                    part = self._get_mock_frame(key)
+                    if part is None:
+                        continue
+                    last_positions = key
                 
                 # Yield frame
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+                yield part
         
         return Response(generate(),
                        mimetype='multipart/x-mixed-replace; boundary=frame')
     
+    def _get_mock_frame(self, key: Tuple[int, int, int]) -> Optional[bytes]:
+        """Return the MJPEG part for the given positions, coalescing concurrent requests."""
+        with self._encode_lock:
+            if key != self._encode_key or self._encode_future is None:
+                if self._encode_pool is None:
+                    return None  # Server stopped
+                self._encode_key = key
+                self._encode_future = self._encode_pool.submit(self._render_mock_frame, *key)
+            future = self._encode_future
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Error encoding mock frame: {e}")
+            return None
+    
+    def _build_mock_background(self) -> np.ndarray:
+        """Draw the parts of the mock frame that never change."""
+        # Create a blank frame
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame[:] = (0, 0, 255)  # Blue background
+        
+        # Add text
+        cv2.putText(frame, "No Camera Available", (50, 240),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        cv2.putText(frame, "Using Mock Camera", (50, 280),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        return frame
+    
+    def _render_mock_frame(self, horizontal: int, vertical: int, focus: int) -> Optional[bytes]:
+        """Render the mock camera frame for the given servo positions as a ready-to-send MJPEG part."""
+        # Each render gets its own copy, renders may run in parallel on the pool
+        frame = self._mock_background.copy()
+        
+        # Add servo positions
+        cv2.putText(frame, f"H: {horizontal}°", (50, 320),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        cv2.putText(frame, f"V: {vertical}°", (50, 360),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        cv2.putText(frame, f"F: {focus}°", (50, 400),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        
+        # Encode frame
+        ret, buffer = cv2.imencode('.jpg', frame, JPEG_PARAMS)
+        if not ret:
+            return None
+        # Frame straight from the encoder's buffer instead of copying it out first
+        return b''.join((b'--frame\r\n', b'Content-Type: image/jpeg\r\n\r\n', buffer.data, b'\r\n'))
+    
     def status(self):
         """Get the current status of all components."""
         return jsonify({
@@ -171,8 +220,7 @@ class WebServer:
             'platform': {
                 'system': platform.system(),
                 'machine': platform.machine(),
-                'is_raspberry_pi': (platform.system() == 'Linux' and 
-                                  platform.machine().startswith('arm'))
+                'is_raspberry_pi': IS_RASPBERRY_PI
             }
         })
     
@@ -199,6 +247,8 @@ class WebServer:
             return
         
         self.is_running = True
+        with self._encode_lock:
+            self._encode_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='mock-encode')
         self.server_thread = threading.Thread(
             target=self.app.run,
             kwargs={'host': host, 'port': port, 'debug': False}
@@ -216,6 +266,15 @@ class WebServer:
         if self.server_thread:
             self.server_thread.join(timeout=5)
             self.server_thread = None
+        # Release the encode threads without waiting on an encode nobody will
+        # collect; a late request finds no pool and gets no frame
+        with self._encode_lock:
+            pool = self._encode_pool
+            self._encode_pool = None
+            self._encode_key = None
+            self._encode_future = None
+        if pool is not None:
+            pool.shutdown(wait=False)
         logger.info("Web server stopped")
 
 if __name__ == "__main__":
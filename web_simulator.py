@@ -1,10 +1,10 @@
 import os
-import time
 import threading
 import cv2
 import numpy as np
 import sys
 from flask import Flask, Response, render_template, request, jsonify
+from config import JPEG_PARAMS
 
 # Create Flask app
 app = Flask(__name__, static_folder='static', template_folder='templates')
@@ -14,9 +14,11 @@ horizontal_pos = 0.0
 vertical_pos = 0.0
 focus_pos = 0.0
 
-# Create simulated camera frame
-frame = None
-frame_lock = threading.Lock()
+# Print every control update; off by default since the sliders send a
+# request per movement and each print is formatted and written under the GIL
+DEBUG = False
+
+# Simulated camera state; frames are cached as encoded parts below
 camera_connected = True
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
@@ -216,6 +218,17 @@ def create_template():
 # Create the template
 create_template()
 
+def _build_grid_frame():
+    """Draw the static background grid once"""
+    grid = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8)
+    for x in range(0, SCREEN_WIDTH, 50):
+        cv2.line(grid, (x, 0), (x, SCREEN_HEIGHT), (30, 30, 30), 1)
+    for y in range(0, SCREEN_HEIGHT, 50):
+        cv2.line(grid, (0, y), (SCREEN_WIDTH, y), (30, 30, 30), 1)
+    return grid
+
+_grid_frame = _build_grid_frame()
+
 def generate_simulated_frame():
     """Generate a simulated camera view"""
     global horizontal_pos, vertical_pos, focus_pos
@@ -225,14 +238,8 @@ def generate_simulated_frame():
     v_pos = (vertical_pos + 1) * 0.5
     f_level = (focus_pos + 1) * 0.5
     
-    # Create a blank frame
-    frame = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8)
-    
-    # Add a grid
-    for x in range(0, SCREEN_WIDTH, 50):
-        cv2.line(frame, (x, 0), (x, SCREEN_HEIGHT), (30, 30, 30), 1)
-    for y in range(0, SCREEN_HEIGHT, 50):
-        cv2.line(frame, (0, y), (SCREEN_WIDTH, y), (30, 30, 30), 1)
+    # Start from a copy of the prebuilt grid
+    frame = _grid_frame.copy()
     
     # Add a horizon line
     horizon_y = int(SCREEN_HEIGHT * v_pos)
@@ -258,22 +265,45 @@ def generate_simulated_frame():
     
     return frame
 
+# Latest (generation, MJPEG part) with boundary, headers and JPEG; the render
+# thread replaces the whole tuple, so streams read it without a lock
+_latest_part = (0, None)
+# Set after each render and then replaced, waking every stream once per frame
+_frame_ready = threading.Event()
+# Set by /api/control when the servos move
+_render_requested = threading.Event()
+
+def render_loop():
+    """Render and encode the simulated view once per servo change, off the request threads"""
+    global _latest_part, _frame_ready
+    
+    while True:
+        _render_requested.wait()
+        _render_requested.clear()
+        
+        _, buffer = cv2.imencode('.jpg', generate_simulated_frame(), JPEG_PARAMS)
+        # Frame straight from the encoder's buffer; every viewer then shares this one object
+        part = b''.join((b'--frame\r\n', b'Content-Type: image/jpeg\r\n\r\n', buffer.data, b'\r\n'))
+        _latest_part = (_latest_part[0] + 1, part)
+        
+        ready = _frame_ready
+        _frame_ready = threading.Event()
+        ready.set()
+
 # Function to generate frames for MJPEG stream
 def generate_frames():
     """Generate frames for MJPEG streaming"""
+    generation = 0
     while True:
-        # Generate a new frame
-        frame = generate_simulated_frame()
-        
-        # Encode as JPEG
-        _, buffer = cv2.imencode('.jpg', frame)
-        frame_bytes = buffer.tobytes()
+        # Take the event before checking, so a render in between can't be missed;
+        # on timeout the same part is re-sent to keep the stream alive
+        ready = _frame_ready
+        if _latest_part[0] == generation:
+            ready.wait(1.0)
         
-        # Yield for MJPEG streaming
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-        
-        time.sleep(0.033)  # ~30fps
+        generation, part = _latest_part
+        if part is not None:
+            yield part
 
 # Set up Flask routes
 @app.route('/')
@@ -309,7 +339,9 @@ def control():
     if 'focus' in data:
         focus_pos = max(-1, min(1, float(data['focus'])))
     
-    print(f"Controls updated: H={horizontal_pos:.2f}, V={vertical_pos:.2f}, F={focus_pos:.2f}")
+    if DEBUG:
+        print(f"Controls updated: H={horizontal_pos:.2f}, V={vertical_pos:.2f}, F={focus_pos:.2f}")
+    _render_requested.set()
     
     return jsonify({
         'success': True,
@@ -319,5 +351,9 @@ def control():
     })
 
 if __name__ == '__main__':
+    # Render the initial view, then re-render only when the controls change
+    threading.Thread(target=render_loop, daemon=True).start()
+    _render_requested.set()
+    
     print("Starting web server on http://localhost:8080")
     app.run(host='0.0.0.0', port=8080, debug=True, threaded=True) 
\ No newline at end of file